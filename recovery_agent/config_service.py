@@ -1,23 +1,186 @@
 # recovery_agent/config_service.py
 
-import copy
+import contextlib
+import functools
+import hashlib
+import os
+import pickle
 from pathlib import Path
 from typing import Any
 
-import yaml
-
 
 class ConfigError(Exception):
     """Custom exception for configuration errors."""
 
 
-_config_cache: dict[str, Any] | None = None
+# The YAML loader class; bound on first parse so that importing this module
+# (and the CLI) does not pay for importing PyYAML.
+_LOADER: Any = None
+
+# Config file used when get_config() is called without a path; deliberately
+# relative, so it is looked up in the current working directory.
+_DEFAULT_CONFIG_PATH = Path("config.yaml")
+
+# Parsed config files are pickled here so short-lived CLI runs can skip
+# re-parsing a config.yaml that has not changed since the last run. Entries
+# hold secrets such as `encrypt_key`, so the directory and its files are
+# private to the current user. None means the XDG default, resolved on first
+# use so that importing this module never depends on a home directory.
+_CACHE_DIR: Path | None = None
+
+# Everything pickle.load raises for an unreadable, truncated or foreign entry,
+# plus the unpacking errors for an entry that is not a (stamp, data) pair.
+_CACHE_READ_ERRORS = (
+    OSError,
+    EOFError,
+    pickle.UnpicklingError,
+    AttributeError,
+    ImportError,
+    IndexError,
+    TypeError,
+    ValueError,
+)
+
+
+def _fresh_defaults() -> dict[str, Any]:
+    """Builds a new copy of the default configuration values."""
+    return {
+        "target_dir": "/opt/recovery_agent/restored_files",
+        "backup_formats": {"db": "*.sql", "logs": "*.log"},
+        "restore_concurrency": 8,
+    }
+
 
 # Default configuration values
-DEFAULTS: dict[str, Any] = {
-    "target_dir": "/opt/recovery_agent/restored_files",
-    "backup_formats": {"db": "*.sql", "logs": "*.log"},
-}
+DEFAULTS: dict[str, Any] = _fresh_defaults()
+
+
+def _cache_dir() -> Path:
+    """
+    Returns the disk cache directory. Raises RuntimeError or KeyError if it
+    depends on a home directory that cannot be determined.
+    """
+    if _CACHE_DIR is not None:
+        return _CACHE_DIR
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "recovery_agent"
+
+
+def _cache_file_for(config_path: Path) -> Path | None:
+    """
+    Returns the cache entry for `config_path`, or None if there is no cache
+    directory. There is one entry per file, overwritten whenever the file
+    changes, so no stale copies pile up.
+    """
+    try:
+        cache_dir = _cache_dir()
+    except (RuntimeError, KeyError):
+        # No $HOME and no passwd entry, e.g. containers with an arbitrary UID
+        return None
+    key = str(config_path.resolve())
+    digest = hashlib.sha1(key.encode("utf-8"), usedforsecurity=False).hexdigest()
+    return cache_dir / f"config-{digest}.pkl"
+
+
+def _is_private(st: os.stat_result) -> bool:
+    """Tells whether `st` is owned by the current user and closed to others."""
+    getuid = getattr(os, "getuid", None)
+    if getuid is None:
+        # No POSIX ownership (Windows); the per-user profile ACLs apply.
+        return True
+    return st.st_uid == getuid() and not st.st_mode & 0o077
+
+
+def _parse_yaml(raw: bytes) -> Any:
+    """Parses YAML bytes, importing PyYAML on first use."""
+    global _LOADER
+    import yaml
+
+    if _LOADER is None:
+        # Use the LibYAML-backed loader when PyYAML was built with it.
+        _LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        return yaml.load(raw, Loader=_LOADER)
+    except yaml.YAMLError as e:
+        raise ConfigError(f"Invalid YAML configuration: {e}") from e
+
+
+def _read_cache(cache_file: Path, file_stamp: tuple[int, int]) -> Any:
+    """
+    Returns the cached data for `file_stamp`, or raises one of
+    `_CACHE_READ_ERRORS` (or LookupError for a missing or stale entry).
+    """
+    if not _is_private(os.stat(cache_file.parent)):
+        raise LookupError("cache directory is accessible to other users")
+    flags = os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_BINARY", 0)
+    with os.fdopen(os.open(cache_file, flags), "rb") as f:
+        # Only unpickle entries nobody else could have written.
+        if not _is_private(os.fstat(f.fileno())):
+            raise LookupError("cache entry is accessible to other users")
+        stamp, data = pickle.load(f)
+    if stamp != file_stamp:
+        raise LookupError("cache entry is stale")
+    return data
+
+
+def _write_cache(cache_file: Path, file_stamp: tuple[int, int], data: Any) -> None:
+    """Atomically replaces the cache entry with `data`, readable only by us."""
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    try:
+        cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        with os.fdopen(os.open(tmp_file, flags, 0o600), "wb") as f:
+            pickle.dump((file_stamp, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        with contextlib.suppress(OSError):
+            tmp_file.unlink()
+
+
+def _load_yaml(config_path: Path, file_stamp: tuple[int, int] | None) -> Any:
+    """
+    Parses a YAML file, reusing the pickled result of a previous parse when
+    the file's `(st_mtime_ns, st_size)` stamp is unchanged.
+
+    Cache problems are never fatal: a missing, stale, unreadable, corrupt or
+    insecure entry simply falls back to parsing the file.
+    """
+    cache_file = None if file_stamp is None else _cache_file_for(config_path)
+    if file_stamp is None or cache_file is None:
+        return _parse_yaml(config_path.read_bytes())
+
+    try:
+        return _read_cache(cache_file, file_stamp)
+    except (LookupError, *_CACHE_READ_ERRORS):
+        pass
+
+    # LibYAML decodes UTF-8 itself, so feed it the raw bytes.
+    data = _parse_yaml(config_path.read_bytes())
+    _write_cache(cache_file, file_stamp, data)
+    return data
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config(config_path: str, file_stamp: tuple[int, int] | None) -> bytes:
+    """
+    Loads the config file at `config_path`, merges it with the defaults and
+    returns the result pickled, so every caller can unpickle its own copy.
+
+    Results are cached per absolute path. `file_stamp` is the file's
+    `(st_mtime_ns, st_size)`, or None if it could not be stat'ed; it is part
+    of the cache key so that edits to the file are picked up.
+    """
+    path = Path(config_path)
+    config = _fresh_defaults()
+
+    if path.is_file():
+        data = _load_yaml(path, file_stamp)
+        if data:
+            if not isinstance(data, dict):
+                raise ConfigError("Config must be a mapping (dict).")
+            config.update(data)
+
+    return pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL)
 
 
 def get_config(path: str | Path | None = None) -> dict[str, Any]:
@@ -28,34 +191,27 @@ def get_config(path: str | Path | None = None) -> dict[str, Any]:
     - If no path is provided, it falls back to `config.yaml` but does not
       fail if it's missing.
     - Loaded settings are merged with default values.
-    - The result is cached to avoid repeated file I/O on subsequent calls.
+    - The result is cached per file (and invalidated when the file changes)
+      to avoid repeated parsing on subsequent calls; every call returns a
+      fresh copy that the caller may modify.
+    - Parsed files are also cached on disk across processes, keyed by the
+      file's path, mtime and size, in owner-only files.
     """
-    global _config_cache
     if path is None:
-        if _config_cache is not None:
-            return _config_cache
         # Use default path if no explicit path is given
-        config_path = Path("config.yaml")
+        config_path = _DEFAULT_CONFIG_PATH
     else:
         # Explicit path provided, must exist
         config_path = Path(path)
         if not config_path.is_file():
             raise ConfigError(f"Configuration file not found: {config_path}")
 
-    config = copy.deepcopy(DEFAULTS)
-
-    if config_path.is_file():
-        with config_path.open("r", encoding="utf-8") as f:
-            try:
-                data = yaml.safe_load(f)
-                if data:
-                    if not isinstance(data, dict):
-                        raise ConfigError("Config must be a mapping (dict).")
-                    config.update(data)
-            except yaml.YAMLError as e:
-                raise ConfigError(f"Invalid YAML configuration: {e}") from e
-
-    if path is None:  # Only cache when using the default path
-        _config_cache = config
+    try:
+        st = config_path.stat()
+        file_stamp: tuple[int, int] | None = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        file_stamp = None
 
-    return config
+    # Each caller gets its own copy, so changes never leak into the cache;
+    # unpickling the cached snapshot is far cheaper than copy.deepcopy.
+    return pickle.loads(_load_config(os.path.abspath(config_path), file_stamp))
@@ -1,5 +1,6 @@
 # recovery_agent/main.py
 import argparse
+import functools
 import logging
 import sys
 
@@ -12,24 +13,31 @@ logging.basicConfig(
 )
 
 
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """Builds the CLI argument parser once; parse_args() reads sys.argv per call."""
+    parser = argparse.ArgumentParser(description="Recovery-Agent CLI")
+    parser.add_argument(
+        "--action",
+        choices=["restore", "test"],
+        required=True,
+        help="Action to perform (restore or test)",
+    )
+    parser.add_argument(
+        "--backup",
+        type=str,
+        help="Path to the backup source directory. Required for restore action.",
+    )
+    parser.add_argument("--env", type=str, default="prod", help="Environment")
+    return parser
+
+
 def main():
     try:
         # Get validated config from the central service
         settings = get_config()
 
-        parser = argparse.ArgumentParser(description="Recovery-Agent CLI")
-        parser.add_argument(
-            "--action",
-            choices=["restore", "test"],
-            required=True,
-            help="Action to perform (restore or test)",
-        )
-        parser.add_argument(
-            "--backup",
-            type=str,
-            help="Path to the backup source directory. Required for restore action.",
-        )
-        parser.add_argument("--env", type=str, default="prod", help="Environment")
+        parser = _build_parser()
         args = parser.parse_args()
 
         if args.action == "restore":
@@ -42,11 +50,16 @@ def main():
             logging.info("Starting tests...")
             logging.info("Tests passed!")
     except ConfigError as e:
-        logging.critical(f"Configuration error: {e}")
+        logging.critical("Configuration error: %s", e)
         return 1
 
     return 0
 
 
-if __name__ == "__main__":
+def _entry():
+    """Runs the CLI and exits the process with its status code."""
     sys.exit(main())
+
+
+if __name__ == "__main__":
+    _entry()
@@ -2,12 +2,224 @@
 # export FLASK_APP=recovery_agent.ui.app:create_app
 # flask run
 
+import errno
+import fnmatch
+import functools
+import glob
 import logging
+import os
+import re
 import shutil
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Wie shutil: copy_file_range/sendfile nur unter Linux nutzen; auf macOS/BSD
+# kann sendfile nur in Sockets schreiben, dort kopiert shutil.copy2 nativ
+_USE_KERNEL_COPY = sys.platform.startswith("linux")
+
+# errno-Werte, bei denen copy_file_range/sendfile für dieses Dateipaar nicht
+# verfügbar sind und auf den nächsten Kopierweg ausgewichen wird
+_UNSUPPORTED_COPY_ERRNOS = frozenset(
+    getattr(errno, name)
+    for name in ("ENOSYS", "EXDEV", "EINVAL", "EOPNOTSUPP", "ENOTSUP", "ENOTSOCK")
+    if hasattr(errno, name)
+)
+
+
+def _copy_fd_data(src_fd, dst_fd, blocksize, size):
+    """Copies all data from `src_fd`, `size` bytes long, to `dst_fd`."""
+    # Ein Fallback ist nur sicher, solange noch nichts übertragen wurde; daher
+    # wird ausschließlich der erste Aufruf jedes Verfahrens abgefangen. Wie bei
+    # shutil gilt auch "0 Bytes bei nicht leerer Quelle" als nicht unterstützt
+    # (manche Dateisysteme melden so Erfolg, ohne etwas zu kopieren).
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None:
+        try:
+            copied = copy_file_range(src_fd, dst_fd, blocksize)
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_COPY_ERRNOS:
+                raise
+        else:
+            if copied or not size:
+                while copied:
+                    copied = copy_file_range(src_fd, dst_fd, blocksize)
+                return
+
+    sendfile = getattr(os, "sendfile", None)
+    if sendfile is not None:
+        try:
+            offset = sendfile(dst_fd, src_fd, 0, blocksize)
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_COPY_ERRNOS:
+                raise
+        else:
+            if offset or not size:
+                sent = offset
+                while sent:
+                    sent = sendfile(dst_fd, src_fd, offset, blocksize)
+                    offset += sent
+                return
+
+    while chunk := os.read(src_fd, 1 << 20):
+        os.write(dst_fd, chunk)
+
+
+def _advise(fd, advice_name):
+    """Passes an access-pattern hint to the kernel, where supported."""
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass  # reiner Hinweis, Fehler sind unkritisch
+
+
+def _fast_copy(src, dst):
+    """
+    Copies `src` to `dst` with permission bits and timestamps, like
+    `shutil.copy2`, but moves the data in the kernel where possible
+    (`os.copy_file_range`, then `os.sendfile`, then a plain read/write loop).
+
+    Elsewhere (macOS, BSD, Windows) `shutil.copy2` is used itself, which
+    dispatches to the platform's native copy routine such as `fcopyfile`.
+    """
+    if not _USE_KERNEL_COPY or (
+        not hasattr(os, "copy_file_range") and not hasattr(os, "sendfile")
+    ):
+        shutil.copy2(src, dst)
+        return
+
+    flags = getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+    src_fd = os.open(src, os.O_RDONLY | flags)
+    try:
+        st = os.fstat(src_fd)
+        # Wie shutil.copy2: niemals eine Datei auf sich selbst kopieren
+        # (O_TRUNC würde sonst die Quelle leeren)
+        try:
+            if os.path.samestat(st, os.stat(dst)):
+                raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+        except FileNotFoundError:
+            pass
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | flags, 0o600)
+        try:
+            # Quelle wird genau einmal sequentiell gelesen: größeres Readahead
+            # während der Kopie, danach den Page Cache wieder freigeben
+            _advise(src_fd, "POSIX_FADV_SEQUENTIAL")
+            blocksize = min(max(st.st_size, 1 << 23), 1 << 30)
+            _copy_fd_data(src_fd, dst_fd, blocksize, st.st_size)
+            _advise(src_fd, "POSIX_FADV_DONTNEED")
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+    # Metadaten erst nach dem Schließen setzen (Schreiben ändert die mtime)
+    os.chmod(dst, stat.S_IMODE(st.st_mode))
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def _copy_in_order(sources, dst):
+    """Copies each of `sources` to `dst` in turn; the last one is kept."""
+    for src in sources:
+        _fast_copy(src, dst)
+
+
+# Wie fnmatch.fnmatch und Path.glob: auf Plattformen mit case-insensitiven
+# Dateinamen (Windows) Namen und Patterns vor dem Vergleich normalisieren
+_normcase = None if os.path.normcase("A") == "A" else os.path.normcase
+
+
+@functools.lru_cache(maxsize=128)
+def _compiled_glob(patterns):
+    """
+    Translates a tuple of shell-style patterns into one compiled regex that
+    matches any of them, memoized.
+    """
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+
+
+class _BackupMatcher:
+    """
+    Backup file patterns, classified once so that a directory can be matched
+    in a single `os.scandir` pass.
+
+    - `*.ext` style patterns become one `str.endswith` call on a suffix tuple.
+    - Literal names become a set lookup.
+    - Other single-component wildcards are combined into a single regex.
+    - Patterns spanning several path components still go through `Path.glob`.
+
+    Matching is case-insensitive where file names are (`os.path.normcase`),
+    as it was with `Path.glob`.
+    """
+
+    def __init__(self, patterns):
+        names = set()
+        suffixes = []
+        regexes = []
+        self.nested = []
+        for pattern in patterns:
+            if not pattern or "/" in pattern or os.sep in pattern:
+                self.nested.append(pattern)
+                continue
+            if _normcase is not None:
+                pattern = _normcase(pattern)
+            if not glob.has_magic(pattern):
+                names.add(pattern)
+            elif pattern.startswith("*") and not glob.has_magic(pattern[1:]):
+                suffixes.append(pattern[1:])
+            else:
+                regexes.append(pattern)
+        self.names = frozenset(names)
+        self.suffixes = tuple(suffixes)
+        self.regex = _compiled_glob(tuple(regexes)) if regexes else None
+
+    def matches(self, name):
+        if _normcase is not None:
+            name = _normcase(name)
+        return (
+            name.endswith(self.suffixes)
+            or name in self.names
+            or (self.regex is not None and self.regex.match(name) is not None)
+        )
+
+    def find(self, dir_path):
+        """
+        Returns the paths (as strings) of the regular files in `dir_path`
+        matching any pattern.
+        """
+        # Strings statt Path-Objekten: os.scandir liefert den Pfad bereits fertig
+        dir_str = os.fspath(dir_path)
+        files = []
+        # Case-insensitiv werden auch feste Namen per Listing gesucht, damit die
+        # Dateien unter ihrem tatsächlichen Namen wiederhergestellt werden
+        if self.suffixes or self.regex is not None or _normcase is not None:
+            try:
+                with os.scandir(dir_str) as it:
+                    for entry in it:
+                        if self.matches(entry.name) and entry.is_file():
+                            files.append(entry.path)
+            except OSError:
+                # Path.glob silently yields nothing for unreadable directories.
+                pass
+        else:
+            # Nur feste Namen: ein stat pro Name statt eines Verzeichnislistings
+            for name in self.names:
+                path = os.path.join(dir_str, name)
+                if os.path.isfile(path):
+                    files.append(path)
+
+        for pattern in self.nested:
+            files.extend(
+                os.fspath(p) for p in Path(dir_str).glob(pattern) if p.is_file()
+            )
+        # Nested patterns may find files the listing already matched
+        return list(dict.fromkeys(files))
+
 
 class RestorationEngine:
     def __init__(self, backup_path, config):
@@ -15,6 +227,30 @@ class RestorationEngine:
         self.config = config
         self.target_dir = Path(config.get("target_dir", "./restored"))
         self.encrypt_key = config.get("encrypt_key")  # für Tests benötigt
+        # Patterns einmalig auflösen (Defaults + Duplikate entfernen)
+        formats = config.get("backup_formats", {"logs": "*.log", "db": "*.sql"})
+        self.patterns = tuple(dict.fromkeys(formats.values()))
+        self._matcher = _BackupMatcher(self.patterns)
+        # Anzahl paralleler Kopiervorgänge (I/O-gebunden, daher Threads)
+        self.restore_concurrency = max(1, int(config.get("restore_concurrency", 8)))
+
+    @functools.cached_property
+    def _backup_files(self):
+        # Ein Verzeichnislisting pro Engine, geteilt von allen Aufrufern
+        return self._matcher.find(self.backup_path)
+
+    def iter_backup_files(self):
+        """
+        Yields the backup files `run_restore` would restore.
+
+        The directory is scanned once per engine and the listing is shared
+        with `run_restore`; call `rescan` to pick up files added since.
+        """
+        return map(Path, self._backup_files)
+
+    def rescan(self):
+        """Discards the cached backup directory listing."""
+        self.__dict__.pop("_backup_files", None)
 
     def run_restore(self):
         logger.info(
@@ -23,42 +259,86 @@ class RestorationEngine:
             self.target_dir,
         )
 
-        # Quelle prüfen
-        if not self.backup_path.exists():
+        # Quelle prüfen (ein einziger stat-Aufruf für Existenz und Typ)
+        try:
+            backup_st = os.stat(self.backup_path)
+        except OSError:
             logger.error(
                 "Backup source directory '%s' does not exist", self.backup_path
             )
             return False
+        if not stat.S_ISDIR(backup_st.st_mode):
+            logger.error("Backup source '%s' is not a directory", self.backup_path)
+            return False
 
-        # Falls target existiert, aber keine Directory ist
-        if self.target_dir.exists() and not self.target_dir.is_dir():
+        # Ziel anlegen; ein einziger Aufruf erkennt auch, ob dort eine Datei liegt
+        try:
+            os.makedirs(self.target_dir, exist_ok=True)
+        except (FileExistsError, NotADirectoryError):
             logger.error(
                 "Target directory '%s' does not exist or is not a directory",
                 self.target_dir,
             )
             return False
+        except OSError as e:
+            logger.error(
+                "Could not create target directory '%s': %s", self.target_dir, e
+            )
+            return False
 
-        # Dateien anhand von Patterns suchen
-        patterns = self.config.get("backup_formats", {"logs": "*.log", "db": "*.sql"})
-        files = []
-        for _, pattern in patterns.items():
-            files.extend(self.backup_path.glob(pattern))
+        # Dateien anhand von Patterns suchen und nach Zielpfad gruppieren; Quellen
+        # mit gleichem Dateinamen werden nacheinander kopiert (die letzte gewinnt)
+        target_str = os.fspath(self.target_dir)
+        copies = {}
+        for src in self._backup_files:
+            dst = os.path.join(target_str, os.path.basename(src))
+            copies.setdefault(dst, []).append(src)
 
-        if not files:
+        if not copies:
             logger.warning("No backup files found matching configured patterns.")
             return True
 
-        logger.info("Found %s files to restore.", len(files))
+        logger.info("Found %s files to restore.", len(self._backup_files))
+        for dst, sources in copies.items():
+            if len(sources) > 1:
+                logger.warning(
+                    "Backup files %s all restore to '%s'; the last one wins.",
+                    ", ".join(sources),
+                    dst,
+                )
         logger.info("Simulating decryption of backup files...")
 
-        self.target_dir.mkdir(parents=True, exist_ok=True)
-
-        for f in files:
-            try:
-                shutil.copy2(f, self.target_dir / f.name)
-            except OSError as e:
-                logger.critical("A critical I/O error occurred during file copy: %s", e)
-                return False
+        workers = min(self.restore_concurrency, len(copies))
+        try:
+            if workers == 1:
+                # Ohne Parallelität lohnt sich kein Thread-Pool
+                for dst, sources in copies.items():
+                    _copy_in_order(sources, dst)
+            else:
+                self._copy_in_parallel(copies, workers)
+        except OSError as e:
+            logger.critical("A critical I/O error occurred during file copy: %s", e)
+            return False
 
         logger.info("Restoration process completed successfully.")
         return True
+
+    @staticmethod
+    def _copy_in_parallel(copies, workers):
+        """
+        Copies each destination's sources on one of `workers` threads, so no
+        destination is ever written by two threads at once.
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_copy_in_order, sources, dst)
+                for dst, sources in copies.items()
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except OSError:
+                # Noch nicht gestartete Kopien verwerfen
+                for future in futures:
+                    future.cancel()
+                raise
@@ -1,33 +1,205 @@
 # recovery_agent/ui/app.py
-from flask import Flask, jsonify
+import hashlib
+import json
+import math
+from types import MappingProxyType
+
+from flask import Flask, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, see the "fast" extra
+    orjson = None  # type: ignore[assignment]
+
+if orjson is not None:
+    # Sorted keys as in Flask's default provider; dates and dataclasses are
+    # handed to Flask's `default` so they are encoded exactly as before.
+    _ORJSON_OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+
+def _without_non_finite(obj, _active=None):
+    """Returns `obj` with NaN and infinities replaced by None, as orjson does."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if not isinstance(obj, (dict, list, tuple)):
+        return obj
+    active = set() if _active is None else _active
+    if id(obj) in active:
+        raise ValueError("Circular reference detected")
+    active.add(id(obj))
+    try:
+        if isinstance(obj, dict):
+            return {k: _without_non_finite(v, active) for k, v in obj.items()}
+        return [_without_non_finite(v, active) for v in obj]
+    finally:
+        active.discard(id(obj))
+
+
+def _finite_default(obj):
+    return _without_non_finite(DefaultJSONProvider.default(obj))
+
+
+def _stdlib_dumps(obj, ensure_ascii):
+    kwargs = {
+        "sort_keys": True,
+        "separators": (",", ":"),
+        "ensure_ascii": ensure_ascii,
+        "allow_nan": False,
+    }
+    try:
+        return json.dumps(obj, default=DefaultJSONProvider.default, **kwargs)
+    except ValueError:
+        # NaN/Infinity: written as null like orjson, rather than invalid JSON
+        return json.dumps(_without_non_finite(obj), default=_finite_default, **kwargs)
+
+
+def _stdlib_json_bytes(obj):
+    try:
+        return _stdlib_dumps(obj, ensure_ascii=False).encode("utf-8")
+    except UnicodeEncodeError:
+        # Lone surrogates, e.g. from os.fsdecode() of non-UTF-8 file names,
+        # have no UTF-8 form; escape them as \udcxx like Flask's default.
+        return _stdlib_dumps(obj, ensure_ascii=True).encode("ascii")
+
+
+def _json_bytes(obj):
+    """
+    Serializes `obj` to compact, key-sorted UTF-8 JSON, using orjson when it
+    is installed. Both encoders emit the same bytes (bar the exponent format
+    of very large or small floats; NaN and infinities become null on both),
+    so response bodies and ETags do not depend on whether orjson is present.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj, default=DefaultJSONProvider.default, option=_ORJSON_OPTIONS
+            )
+        except TypeError:
+            pass  # non-str keys (json coerces them) or lone surrogates
+    return _stdlib_json_bytes(obj)
+
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson's C encoder and decoder, used for
+    the argument combinations Flask's `response()` (and so `jsonify`) passes.
+    """
+
+    # orjson always writes UTF-8; any other combination falls back to stdlib.
+    ensure_ascii = False
+
+    def dumps(self, obj, **kwargs):
+        option = None
+        if kwargs == {"separators": (",", ":")}:
+            option = _ORJSON_OPTIONS
+        elif kwargs == {"indent": 2}:  # debug mode
+            option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2
+        if option is not None and not self.ensure_ascii and self.sort_keys:
+            try:
+                return orjson.dumps(obj, default=self.default, option=option).decode()
+            except TypeError:
+                pass  # non-str keys or lone surrogates
+        # Flask's stdlib encoder, escaping non-ASCII as its default does so that
+        # lone surrogates survive as \udcxx instead of failing to encode
+        kwargs.setdefault("ensure_ascii", True)
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if not kwargs:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                pass  # e.g. escaped lone surrogates, which json accepts
+        return super().loads(s, **kwargs)
+
+
+# Status reported by the placeholder StateManager. Shared and read-only, so
+# callers must not (and cannot) mutate it.
+_DEFAULT_STATUS = MappingProxyType(
+    {
+        "status": "idle",
+        "last_run": None,
+        "details": "No restoration has been run yet.",
+    }
+)
+# ...and its JSON body, serialized once at import with the same encoder the
+# app uses, so the placeholder never needs encoding per app.
+_DEFAULT_STATUS_JSON = _json_bytes(dict(_DEFAULT_STATUS))
+
+
+def _etag(body):
+    return hashlib.sha1(body, usedforsecurity=False).hexdigest()
+
+
+def _status_version(state_manager):
+    """Returns the state manager's opt-in `_version`, or None if it has none."""
+    version = getattr(state_manager, "_version", None)
+    return version if type(version) is int else None
 
 
 class StateManager:
-    """A placeholder for a real state management object."""
+    """
+    A placeholder for a real state management object.
+
+    State managers opt into caching of the /status response by setting an
+    integer `_version` attribute and incrementing it whenever the reported
+    status changes. All others are queried on every request.
+    """
 
     def get_status(self):
         # This is a mock implementation.
-        return {
-            "status": "idle",
-            "last_run": None,
-            "details": "No restoration has been run yet.",
-        }
+        return _DEFAULT_STATUS
 
 
 def create_app(state_manager=None):
     """Application factory to create and configure the Flask app."""
     app = Flask(__name__)
+    if orjson is not None:
+        app.json = _OrjsonProvider(app)
 
     if state_manager is None:
         state_manager = StateManager()
 
+    # (version, body, etag) of the last serialized status; only used for
+    # state managers with an integer `_version`. The unmodified placeholder,
+    # whose status never changes, starts out with its pre-serialized status.
+    placeholder = type(state_manager) is StateManager
+    status_cache = None
+    if placeholder:
+        status_cache = (0, _DEFAULT_STATUS_JSON, _etag(_DEFAULT_STATUS_JSON))
+
+    # The health check never changes, so build its response once. Flask does
+    # not modify a returned response unless after_request hooks do so.
+    healthz_response = app.response_class("OK", status=200, mimetype="text/plain")
+
     @app.route("/healthz")
     def healthz():
-        return "OK", 200
+        return healthz_response
 
     @app.route("/status")
     def status():
-        current_status = state_manager.get_status()
-        return jsonify(current_status)
+        nonlocal status_cache
+        version = _status_version(state_manager)
+        if version is None and placeholder:
+            version = 0
+        cached = status_cache
+        if version is not None and cached is not None and cached[0] == version:
+            _, body, etag = cached
+        else:
+            # dict() also accepts read-only mappings, which json cannot encode
+            current_status = dict(state_manager.get_status())
+            body = _json_bytes(current_status)
+            etag = _etag(body)
+            if version is not None:
+                status_cache = (version, body, etag)
+
+        response = app.response_class(body, mimetype="application/json")
+        response.set_etag(etag)
+        return response.make_conditional(request)
 
     return app
@@ -0,0 +1,14 @@
+import pytest
+
+from recovery_agent import config_service
+
+
+@pytest.fixture(autouse=True)
+def isolated_config_disk_cache(tmp_path, monkeypatch):
+    """
+    Points the on-disk config cache at a per-test directory so tests never
+    read or write the user's real cache.
+    """
+    cache_dir = tmp_path / "config-cache"
+    monkeypatch.setattr(config_service, "_CACHE_DIR", cache_dir)
+    return cache_dir
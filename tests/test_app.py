@@ -1,7 +1,14 @@
 # tests/test_app.py
+import json
+import os
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
 import pytest
+from flask.json.provider import DefaultJSONProvider
 
-from recovery_agent.ui.app import create_app
+from recovery_agent.ui import app as app_module
+from recovery_agent.ui.app import StateManager, create_app
 
 
 @pytest.fixture
@@ -31,3 +38,253 @@ def test_non_existent_route_returns_404(client):
     """Negative test to ensure an unknown route returns a 404 error."""
     resp = client.get("/this-route-does-not-exist")
     assert resp.status_code == 404
+
+
+def test_status_endpoint_supports_etag_revalidation(client):
+    """Tests that /status answers 304 when the client's ETag is current."""
+    first = client.get("/status")
+    etag = first.headers["ETag"]
+
+    resp = client.get("/status", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.data == b""
+
+
+class CountingStateManager(StateManager):
+    """A state manager that records how often its status is read."""
+
+    def __init__(self):
+        self.calls = 0
+        self.state = "idle"
+
+    def get_status(self):
+        self.calls += 1
+        return {"status": self.state}
+
+
+def test_status_endpoint_reuses_serialized_status_until_version_changes():
+    """
+    Tests that the status is only re-read and re-serialized after the state
+    manager's version changes.
+    """
+    state_manager = CountingStateManager()
+    state_manager._version = 0
+    client = create_app(state_manager).test_client()
+
+    etag = client.get("/status").headers["ETag"]
+    assert client.get("/status").get_json() == {"status": "idle"}
+    assert state_manager.calls == 1
+
+    state_manager.state = "restoring"
+    state_manager._version += 1
+    resp = client.get("/status", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.get_json() == {"status": "restoring"}
+    assert state_manager.calls == 2
+
+
+def test_status_endpoint_without_version_always_reads_state():
+    """
+    Tests that state managers without a version are queried on every request.
+    """
+
+    class UnversionedStateManager:
+        calls = 0
+
+        def get_status(self):
+            self.calls += 1
+            return {"status": "idle"}
+
+    state_manager = UnversionedStateManager()
+    client = create_app(state_manager).test_client()
+    client.get("/status")
+    client.get("/status")
+    assert state_manager.calls == 2
+
+
+def test_status_endpoint_reads_subclass_without_version_every_time():
+    """
+    Tests that a StateManager subclass that never opts in with `_version`
+    serves its live status rather than the first one it reported.
+    """
+    state_manager = CountingStateManager()
+    client = create_app(state_manager).test_client()
+
+    assert client.get("/status").get_json() == {"status": "idle"}
+    state_manager.state = "restoring"
+    assert client.get("/status").get_json() == {"status": "restoring"}
+    assert state_manager.calls == 2
+
+
+def test_status_endpoint_ignores_non_int_version():
+    """
+    Tests that duck-typed state managers whose `_version` is not an int,
+    e.g. mocks, are queried on every request.
+    """
+    state_manager = MagicMock()
+    state_manager.get_status.side_effect = [{"n": 1}, {"n": 2}]
+    client = create_app(state_manager).test_client()
+
+    assert client.get("/status").get_json() == {"n": 1}
+    assert client.get("/status").get_json() == {"n": 2}
+
+
+def test_healthz_endpoint_is_stable_across_requests(client):
+    """Tests that the shared /healthz response can be served repeatedly."""
+    for _ in range(3):
+        resp = client.get("/healthz")
+        assert resp.status_code == 200
+        assert resp.data == b"OK"
+        assert resp.mimetype == "text/plain"
+
+
+def test_default_status_is_shared_and_read_only():
+    """Tests that the placeholder status is a single immutable mapping."""
+    state_manager = StateManager()
+    status = state_manager.get_status()
+    assert status is state_manager.get_status()
+    with pytest.raises(TypeError):
+        status["status"] = "running"
+
+
+def test_default_status_is_served_pre_serialized():
+    """
+    Tests that the placeholder's pre-serialized status matches what Flask
+    would produce, and is served without calling get_status().
+    """
+    state_manager = StateManager()
+    app = create_app(state_manager)
+    with patch.object(StateManager, "get_status") as mock_get_status:
+        resp = app.test_client().get("/status")
+        mock_get_status.assert_not_called()
+
+    expected = json.dumps(
+        dict(StateManager().get_status()), sort_keys=True, separators=(",", ":")
+    )
+    assert resp.data == expected.encode()
+    assert resp.get_json()["status"] == "idle"
+
+    state_manager._version = 1
+    with patch.object(StateManager, "get_status", return_value={"status": "busy"}):
+        assert app.test_client().get("/status").get_json() == {"status": "busy"}
+
+
+def test_json_encoding_matches_flask_default_provider():
+    """
+    Tests that the app's JSON encoding (orjson when installed) produces the
+    same documents as Flask's stdlib-based provider, including dates.
+    """
+
+    class DatedStateManager:
+        def get_status(self):
+            return {"status": "done", "last_run": datetime(2024, 5, 1, 12, 30)}
+
+    app = create_app(DatedStateManager())
+    resp = app.test_client().get("/status")
+
+    expected = DefaultJSONProvider(app).dumps(DatedStateManager().get_status())
+    assert resp.get_json() == json.loads(expected)
+    assert resp.get_json()["last_run"] == "Wed, 01 May 2024 12:30:00 GMT"
+    assert app.json.loads(app.json.dumps({"a": [1, 2]})) == {"a": [1, 2]}
+
+
+def test_app_falls_back_to_stdlib_json_without_orjson(monkeypatch):
+    """Tests that the app still serves JSON when orjson is not installed."""
+    monkeypatch.setattr(app_module, "orjson", None)
+
+    app = create_app(CountingStateManager())
+    assert type(app.json) is DefaultJSONProvider
+    assert app.test_client().get("/status").get_json() == {"status": "idle"}
+
+
+def test_orjson_provider_accepts_stdlib_options():
+    """Tests that stdlib-only options fall back to Flask's implementation."""
+    pytest.importorskip("orjson")
+    app = create_app()
+    assert app.json.dumps({"a": 1}, indent=2) == '{\n  "a": 1\n}'
+    assert app.json.loads('{"a": 1}', parse_int=str) == {"a": "1"}
+
+
+@pytest.mark.parametrize(
+    "status",
+    [
+        {10: "x", 2: None},
+        {"details": "Wiederherstellung läuft", "n": [1, 2.5]},
+        {"details": os.fsdecode(b"/backup/caf\xe9.sql")},
+        {"x": float("nan"), "y": [float("inf"), -float("inf")], "z": 1.5},
+    ],
+    ids=["non-str-keys", "non-ascii", "lone-surrogate", "non-finite"],
+)
+def test_status_body_does_not_depend_on_orjson(monkeypatch, status):
+    """
+    Tests that /status serves the same bytes (and so the same ETag) with and
+    without orjson, including keys orjson cannot encode itself.
+    """
+
+    class FixedStateManager:
+        def get_status(self):
+            return status
+
+    with_orjson = create_app(FixedStateManager()).test_client().get("/status")
+    decoded = with_orjson.get_json()
+    monkeypatch.setattr(app_module, "orjson", None)
+    without = create_app(FixedStateManager()).test_client().get("/status")
+
+    assert with_orjson.status_code == without.status_code == 200
+    assert decoded == json.loads(without.data)
+    assert with_orjson.data == without.data
+    assert with_orjson.headers["ETag"] == without.headers["ETag"]
+
+
+def test_json_bytes_escapes_lone_surrogates_and_nulls_non_finite():
+    """
+    Tests the stdlib encoder's handling of values with no plain JSON form.
+    """
+    name = os.fsdecode(b"caf\xe9.sql")
+    assert app_module._stdlib_json_bytes({"f": name}) == b'{"f":"caf\\udce9.sql"}'
+    nested = {"a": [float("nan"), {"b": float("inf")}], "c": 0.5}
+    assert app_module._stdlib_json_bytes(nested) == b'{"a":[null,{"b":null}],"c":0.5}'
+
+    circular = []
+    circular.append(circular)
+    with pytest.raises(ValueError):
+        app_module._stdlib_json_bytes(circular)
+
+
+def test_jsonify_escapes_lone_surrogates():
+    """Tests that jsonify still serves strings orjson cannot encode."""
+    app = create_app()
+    with app.app_context():
+        resp = app.json.response({"f": os.fsdecode(b"caf\xe9.sql")})
+    assert resp.data == b'{"f":"caf\\udce9.sql"}\n'
+
+
+def test_default_status_bytes_match_stdlib_encoder():
+    """Tests that the pre-serialized placeholder status is compact stdlib JSON."""
+    expected = app_module._stdlib_json_bytes(dict(app_module._DEFAULT_STATUS))
+    assert app_module._DEFAULT_STATUS_JSON == expected
+
+
+@pytest.mark.parametrize("debug", [False, True], ids=["compact", "debug"])
+def test_jsonify_is_encoded_by_orjson(monkeypatch, debug):
+    """
+    Tests that jsonify responses go through orjson and match Flask's default
+    provider in both compact and debug (indented) mode.
+    """
+    orjson = pytest.importorskip("orjson")
+    calls = []
+    real_dumps = orjson.dumps
+
+    def spy(*args, **kwargs):
+        calls.append(args[0])
+        return real_dumps(*args, **kwargs)
+
+    app = create_app()
+    app.debug = debug
+    data = {"b": [1, {}], "a": datetime(2024, 5, 1, 12, 30), "c": None}
+    expected = DefaultJSONProvider(app).response(data).data
+
+    monkeypatch.setattr(app_module.orjson, "dumps", spy)
+    with app.app_context():
+        assert app.json.response(data).data == expected
+    assert calls == [data]
@@ -1,11 +1,29 @@
+import json
+import os
+import pickle
+import stat
+import subprocess
+import sys
 from unittest.mock import mock_open, patch
 
 import pytest
-import yaml
 
 from recovery_agent import config_service
 from recovery_agent.config_service import DEFAULTS, ConfigError, get_config
 
+VALID_CONFIG = {"target_dir": "/tmp/test", "encrypt_key": "abc123"}
+
+
+@pytest.fixture(scope="session")
+def valid_config_path(tmp_path_factory):
+    """
+    Writes the canonical valid config file once per test session. Tests using
+    it must treat the file as read-only.
+    """
+    config_path = tmp_path_factory.mktemp("valid-config") / "config.yaml"
+    config_path.write_text(json.dumps(VALID_CONFIG))
+    return config_path
+
 
 @pytest.fixture(autouse=True)
 def reset_config_cache():
@@ -13,21 +31,17 @@ def reset_config_cache():
     Fixture to automatically reset the config cache before each test.
     This ensures test isolation.
     """
-    config_service._config_cache = None
+    config_service._load_config.cache_clear()
 
 
-def test_get_config_valid(tmp_path):
+def test_get_config_valid(valid_config_path):
     """
     Tests that a valid YAML file is correctly read and merged with defaults.
     """
-    config_path = tmp_path / "config.yaml"
-    config_content = {"target_dir": "/tmp/test", "encrypt_key": "abc123"}
-    config_path.write_text(yaml.dump(config_content))
-
     expected_config = DEFAULTS.copy()
-    expected_config.update(config_content)
+    expected_config.update(VALID_CONFIG)
 
-    conf = get_config(config_path)
+    conf = get_config(valid_config_path)
     assert conf == expected_config
 
 
@@ -74,7 +88,7 @@ def test_get_config_uses_cache():
     """
     Tests that the configuration is read from cache on subsequent calls.
     """
-    config_data = yaml.dump({"key": "value"})
+    config_data = json.dumps({"key": "value"})
     m = mock_open(read_data=config_data)
 
     with (
@@ -90,3 +104,204 @@ def test_get_config_uses_cache():
         second_call_result = get_config()
         assert second_call_result == first_call_result
         m.assert_called_once()
+
+
+def test_get_config_writes_and_reuses_disk_cache(
+    valid_config_path, isolated_config_disk_cache
+):
+    """
+    Tests that a parsed config file is pickled to the disk cache and that a
+    later load of the unchanged file is served from it without re-parsing.
+    """
+    first = get_config(valid_config_path)
+    assert len(list(isolated_config_disk_cache.glob("config-*.pkl"))) == 1
+
+    config_service._load_config.cache_clear()
+    with patch("yaml.load") as mock_load:
+        second = get_config(valid_config_path)
+        mock_load.assert_not_called()
+    assert second == first
+
+
+def test_get_config_disk_cache_invalidated_on_change(tmp_path):
+    """
+    Tests that editing the config file bypasses the stale disk cache entry.
+    """
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(json.dumps({"target_dir": "/tmp/old"}))
+    assert get_config(config_path)["target_dir"] == "/tmp/old"
+
+    config_path.write_text(json.dumps({"target_dir": "/tmp/newer"}))
+    assert get_config(config_path)["target_dir"] == "/tmp/newer"
+
+
+def test_get_config_ignores_corrupt_disk_cache(
+    valid_config_path, isolated_config_disk_cache
+):
+    """
+    Tests that a corrupt disk cache entry falls back to parsing the file.
+    """
+    get_config(valid_config_path)
+    config_service._load_config.cache_clear()
+
+    for cache_file in isolated_config_disk_cache.glob("config-*.pkl"):
+        cache_file.write_bytes(b"not a pickle")
+
+    assert get_config(valid_config_path)["target_dir"] == "/tmp/test"
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions only")
+def test_get_config_disk_cache_is_private(
+    valid_config_path, isolated_config_disk_cache
+):
+    """
+    Tests that the disk cache, which holds secrets such as encrypt_key, is
+    only accessible to the current user.
+    """
+    get_config(valid_config_path)
+
+    assert stat.S_IMODE(isolated_config_disk_cache.stat().st_mode) == 0o700
+    (cache_file,) = isolated_config_disk_cache.glob("config-*.pkl")
+    assert stat.S_IMODE(cache_file.stat().st_mode) == 0o600
+
+
+def test_get_config_disk_cache_keeps_one_entry_per_file(
+    tmp_path, isolated_config_disk_cache
+):
+    """
+    Tests that editing a config file replaces its cache entry instead of
+    leaving a stale copy of the old contents behind.
+    """
+    config_path = tmp_path / "config.yaml"
+    for key in ("old-secret", "new-secret-key"):
+        config_path.write_text(json.dumps({"encrypt_key": key}))
+        assert get_config(config_path)["encrypt_key"] == key
+
+    (cache_file,) = isolated_config_disk_cache.glob("config-*.pkl")
+    assert b"old-secret" not in cache_file.read_bytes()
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions only")
+@pytest.mark.parametrize("mode", [0o644, 0o620], ids=["readable", "writable"])
+def test_get_config_ignores_disk_cache_accessible_to_others(
+    valid_config_path, isolated_config_disk_cache, mode
+):
+    """
+    Tests that a cache entry other users could read or write is never
+    unpickled and the config file is parsed instead.
+    """
+    get_config(valid_config_path)
+    config_service._load_config.cache_clear()
+
+    st = valid_config_path.stat()
+    (cache_file,) = isolated_config_disk_cache.glob("config-*.pkl")
+    planted = ((st.st_mtime_ns, st.st_size), {"target_dir": "/tmp/planted"})
+    cache_file.write_bytes(pickle.dumps(planted))
+    os.chmod(cache_file, mode)
+
+    assert get_config(valid_config_path)["target_dir"] == "/tmp/test"
+
+
+def test_get_config_without_home_directory_skips_disk_cache(
+    valid_config_path, monkeypatch
+):
+    """
+    Tests that configs still load, uncached on disk, when no cache directory
+    can be determined because there is no home directory.
+    """
+
+    def no_home():
+        raise RuntimeError("Could not determine home directory.")
+
+    monkeypatch.setattr(config_service, "_CACHE_DIR", None)
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    monkeypatch.setattr(config_service.Path, "home", no_home)
+
+    assert get_config(valid_config_path)["target_dir"] == "/tmp/test"
+
+
+def test_cache_dir_defaults_to_xdg_cache_home(tmp_path, monkeypatch):
+    """Tests that the disk cache lives under $XDG_CACHE_HOME by default."""
+    monkeypatch.setattr(config_service, "_CACHE_DIR", None)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert config_service._cache_dir() == tmp_path / "recovery_agent"
+
+
+def test_importing_config_service_does_not_import_yaml():
+    """
+    Tests that PyYAML is only imported once a config file is actually parsed.
+    """
+    code = "import sys, recovery_agent.config_service; sys.exit('yaml' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], check=False)
+    assert result.returncode == 0
+
+
+def test_get_config_cache_picks_up_same_size_rewrite(tmp_path):
+    """
+    Tests that the in-process cache is invalidated by a newer mtime alone,
+    even when the rewritten file has the same size.
+    """
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(json.dumps({"target_dir": "/tmp/a"}))
+    assert get_config(config_path)["target_dir"] == "/tmp/a"
+    assert get_config(config_path)["target_dir"] == "/tmp/a"
+    assert config_service._load_config.cache_info().misses == 1
+
+    st = config_path.stat()
+    config_path.write_text(json.dumps({"target_dir": "/tmp/b"}))
+    assert config_path.stat().st_size == st.st_size
+    os.utime(config_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert get_config(config_path)["target_dir"] == "/tmp/b"
+    assert config_service._load_config.cache_info().misses == 2
+
+
+def test_get_config_returns_independent_copies(valid_config_path):
+    """
+    Tests that modifying a returned config does not affect later calls.
+    """
+    first = get_config(valid_config_path)
+    first["target_dir"] = "MUTATED"
+    first["backup_formats"]["extra"] = "*.bak"
+
+    second = get_config(valid_config_path)
+    assert second["target_dir"] == "/tmp/test"
+    assert "extra" not in second["backup_formats"]
+    assert config_service._load_config.cache_info().hits == 1
+
+
+def test_get_config_caches_multiple_paths(tmp_path):
+    """
+    Tests that configs loaded from different paths are cached independently.
+    """
+    paths = []
+    for name in ("one", "two"):
+        config_path = tmp_path / f"{name}.yaml"
+        config_path.write_text(json.dumps({"target_dir": f"/tmp/{name}"}))
+        paths.append(config_path)
+
+    configs = [get_config(p) for p in paths]
+    assert [c["target_dir"] for c in configs] == ["/tmp/one", "/tmp/two"]
+    assert [get_config(p) for p in paths] == configs
+    assert config_service._load_config.cache_info().hits == 2
+
+
+def test_get_config_survives_unwritable_disk_cache(
+    valid_config_path, isolated_config_disk_cache
+):
+    """
+    Tests that failing to write the disk cache does not break config loading.
+    """
+    isolated_config_disk_cache.write_text("a file where the cache dir should be")
+
+    assert get_config(valid_config_path)["target_dir"] == "/tmp/test"
+    assert not list(valid_config_path.parent.glob("*.tmp"))
+
+
+def test_get_config_default_path_missing_returns_defaults(tmp_path, monkeypatch):
+    """
+    Tests that a missing default config.yaml yields the defaults.
+    """
+    monkeypatch.chdir(tmp_path)
+    assert get_config() == DEFAULTS
@@ -1,7 +1,11 @@
 # tests/test_engine.py
+import errno
 import logging
-import shutil
+import os
 
+import pytest
+
+from recovery_agent.restoration import engine as engine_module
 from recovery_agent.restoration.engine import RestorationEngine
 
 
@@ -91,11 +95,11 @@ def test_run_restore_handles_io_error(tmp_path, monkeypatch, caplog):
     target_dir.mkdir()
     (source_dir / "app.log").touch()
 
-    # Mock shutil.copy2 to raise an IOError
-    def mock_copy2(*args, **kwargs):
+    # Mock the engine's copy helper to raise an IOError
+    def mock_copy(*args, **kwargs):
         raise OSError("Disk full!")
 
-    monkeypatch.setattr(shutil, "copy2", mock_copy2)
+    monkeypatch.setattr(engine_module, "_fast_copy", mock_copy)
 
     mock_config = create_mock_config()
     mock_config["target_dir"] = str(target_dir)
@@ -109,6 +113,30 @@ def test_run_restore_handles_io_error(tmp_path, monkeypatch, caplog):
         assert "Disk full!" in caplog.text
 
 
+def test_run_restore_handles_io_error_in_parallel_copy(tmp_path, monkeypatch, caplog):
+    """
+    Tests that an IOError raised on a worker thread fails the restore.
+    """
+    source_dir = tmp_path / "backup"
+    target_dir = tmp_path / "target"
+    source_dir.mkdir()
+    (source_dir / "app.log").touch()
+    (source_dir / "db.sql").touch()
+
+    def mock_copy(*args, **kwargs):
+        raise OSError("Disk full!")
+
+    monkeypatch.setattr(engine_module, "_fast_copy", mock_copy)
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+
+    with caplog.at_level(logging.CRITICAL):
+        assert engine.run_restore() is False
+        assert "Disk full!" in caplog.text
+
+
 def test_run_restore_success_with_no_matching_files(tmp_path, caplog):
     """
     Tests that run_restore completes successfully and logs a warning
@@ -157,3 +185,546 @@ def test_run_restore_fails_if_target_dir_is_a_file(tmp_path, caplog):
             f"Target directory '{target_file}' does not exist or is not a directory"
             in caplog.text
         )
+
+
+def test_run_restore_supports_literal_and_wildcard_patterns(tmp_path):
+    """
+    Tests that literal file names and wildcard patterns both select the
+    expected backup files.
+    """
+    source_dir = tmp_path / "backup"
+    target_dir = tmp_path / "target"
+    source_dir.mkdir()
+    (source_dir / "manifest.json").touch()
+    (source_dir / "a.sql").touch()
+    (source_dir / "b.sql").touch()
+    (source_dir / "notes.txt").touch()
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    mock_config["backup_formats"] = {
+        "manifest": "manifest.json",
+        "missing": "absent.json",
+        "db": "*.sql",
+    }
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+
+    assert engine.run_restore() is True
+    assert sorted(p.name for p in target_dir.iterdir()) == [
+        "a.sql",
+        "b.sql",
+        "manifest.json",
+    ]
+
+
+def test_run_restore_supports_only_literal_patterns(tmp_path):
+    """
+    Tests that backup formats made up only of literal names select exactly
+    the existing regular files with those names.
+    """
+    source_dir = tmp_path / "backup"
+    target_dir = tmp_path / "target"
+    source_dir.mkdir()
+    (source_dir / "manifest.json").touch()
+    (source_dir / "SHA256SUMS").touch()
+    (source_dir / "data").mkdir()
+    (source_dir / "other.json").touch()
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    mock_config["backup_formats"] = {
+        "manifest": "manifest.json",
+        "checksums": "SHA256SUMS",
+        "data": "data",
+        "missing": "absent.json",
+    }
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+
+    assert engine.run_restore() is True
+    assert sorted(p.name for p in target_dir.iterdir()) == [
+        "SHA256SUMS",
+        "manifest.json",
+    ]
+
+
+def test_iter_backup_files_treats_unreadable_directory_as_empty(tmp_path, monkeypatch):
+    """
+    Tests that a backup directory that cannot be listed yields no files,
+    like Path.glob does.
+    """
+
+    def denied(path):
+        raise PermissionError(13, "Permission denied", path)
+
+    monkeypatch.setattr(engine_module.os, "scandir", denied)
+    engine = RestorationEngine(backup_path=str(tmp_path), config=create_mock_config())
+
+    assert list(engine.iter_backup_files()) == []
+
+
+def test_run_restore_matches_case_insensitively_where_names_are(tmp_path, monkeypatch):
+    """
+    Tests that on platforms with case-insensitive file names (simulated here)
+    every kind of pattern ignores case, and files keep their own names.
+    """
+    monkeypatch.setattr(engine_module, "_normcase", str.lower)
+    source_dir = tmp_path / "backup"
+    target_dir = tmp_path / "target"
+    source_dir.mkdir()
+    for name in ("a.sql", "Manifest.JSON", "DB_1.Sql", "notes.txt"):
+        (source_dir / name).touch()
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    mock_config["backup_formats"] = {
+        "dump": "*.SQL",
+        "manifest": "manifest.json",
+        "db": "db_?.sql",
+    }
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+
+    assert engine.run_restore() is True
+    assert sorted(p.name for p in target_dir.iterdir()) == [
+        "DB_1.Sql",
+        "Manifest.JSON",
+        "a.sql",
+    ]
+
+
+def test_run_restore_combines_several_wildcard_patterns(tmp_path):
+    """
+    Tests that several general wildcard patterns each select their files
+    once they are combined into a single regex.
+    """
+    source_dir = tmp_path / "backup"
+    target_dir = tmp_path / "target"
+    source_dir.mkdir()
+    for name in ("db_2024.sql", "app-1.log", "app-10.log", "a.txt", "c.txt"):
+        (source_dir / name).touch()
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    mock_config["backup_formats"] = {
+        "db": "db_*.sql",
+        "logs": "app-?.log",
+        "notes": "[ab].txt",
+    }
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+
+    assert engine.run_restore() is True
+    assert sorted(p.name for p in target_dir.iterdir()) == [
+        "a.txt",
+        "app-1.log",
+        "db_2024.sql",
+    ]
+
+
+def test_run_restore_fails_if_backup_source_is_a_file(tmp_path, caplog):
+    """Tests that run_restore fails if the backup source is not a directory."""
+    source_file = tmp_path / "backup.sql"
+    source_file.touch()
+    target_dir = tmp_path / "target"
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    engine = RestorationEngine(backup_path=str(source_file), config=mock_config)
+
+    with caplog.at_level(logging.ERROR):
+        success = engine.run_restore()
+
+        assert success is False
+        assert f"Backup source '{source_file}' is not a directory" in caplog.text
+        assert not target_dir.exists()
+
+
+def test_engine_resolves_patterns_once(tmp_path):
+    """
+    Tests that backup patterns are resolved at construction, falling back to
+    the defaults and dropping duplicates.
+    """
+    engine = RestorationEngine(backup_path=str(tmp_path), config={})
+    assert engine.patterns == ("*.log", "*.sql")
+
+    mock_config = create_mock_config()
+    mock_config["backup_formats"] = {"a": "*.sql", "b": "*.sql"}
+    engine = RestorationEngine(backup_path=str(tmp_path), config=mock_config)
+    assert engine.patterns == ("*.sql",)
+
+
+def test_run_restore_lists_file_matching_several_patterns_once(tmp_path, caplog):
+    """
+    Tests that a file matched by more than one pattern is restored only once.
+    """
+    source_dir = tmp_path / "backup"
+    target_dir = tmp_path / "target"
+    source_dir.mkdir()
+    (source_dir / "db.sql").touch()
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    mock_config["backup_formats"] = {"db": "*.sql", "prefix": "db*"}
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+
+    with caplog.at_level(logging.INFO):
+        assert engine.run_restore() is True
+        assert "Found 1 files to restore." in caplog.text
+
+
+def test_run_restore_copies_same_named_files_one_after_another(tmp_path, caplog):
+    """
+    Tests that backup files from different subdirectories sharing a name are
+    never copied onto the same target concurrently: the last listed one is
+    restored intact and the collision is logged.
+    """
+    source_dir = tmp_path / "backup"
+    target_dir = tmp_path / "target"
+    for sub, byte in (("x", b"A"), ("y", b"B")):
+        (source_dir / sub).mkdir(parents=True)
+        (source_dir / sub / "app.log").write_bytes(byte * (1 << 20))
+    (source_dir / "db.sql").write_text("-- dump")
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    mock_config["backup_formats"] = {"logs": "*/app.log", "db": "*.sql"}
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+    last_log = [p for p in engine.iter_backup_files() if p.name == "app.log"][-1]
+
+    with caplog.at_level(logging.WARNING):
+        assert engine.run_restore() is True
+        assert "the last one wins" in caplog.text
+
+    assert (target_dir / "app.log").read_bytes() == last_log.read_bytes()
+    assert (target_dir / "db.sql").read_text() == "-- dump"
+
+
+def test_run_restore_lists_file_matched_by_nested_and_flat_pattern_once(
+    tmp_path, caplog
+):
+    """
+    Tests that a file found both by the directory listing and by a nested
+    pattern is restored once, without a collision warning.
+    """
+    source_dir = tmp_path / "backup"
+    target_dir = tmp_path / "target"
+    source_dir.mkdir()
+    (source_dir / "app.log").write_text("log")
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    mock_config["backup_formats"] = {"a": "*.log", "b": "./app.log"}
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+
+    with caplog.at_level(logging.INFO):
+        assert engine.run_restore() is True
+        assert "Found 1 files to restore." in caplog.text
+        assert "the last one wins" not in caplog.text
+    assert list(engine.iter_backup_files()) == [source_dir / "app.log"]
+
+
+def test_run_restore_copies_files_concurrently(tmp_path):
+    """
+    Tests that all matching files are restored when copies run in parallel,
+    and that the concurrency setting is read from the config.
+    """
+    source_dir = tmp_path / "backup"
+    target_dir = tmp_path / "target"
+    source_dir.mkdir()
+    for i in range(10):
+        (source_dir / f"part{i}.sql").write_text(f"-- dump {i}")
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    mock_config["restore_concurrency"] = 4
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+    assert engine.restore_concurrency == 4
+
+    assert engine.run_restore() is True
+    for i in range(10):
+        assert (target_dir / f"part{i}.sql").read_text() == f"-- dump {i}"
+
+
+@pytest.mark.parametrize(
+    "concurrency,file_count", [(1, 3), (8, 1)], ids=["serial", "single-file"]
+)
+def test_run_restore_copies_inline_without_parallelism(
+    tmp_path, monkeypatch, concurrency, file_count
+):
+    """
+    Tests that no thread pool is started when only one copy can run at a
+    time, and that the files are still restored.
+    """
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("thread pool should not be used")
+
+    monkeypatch.setattr(engine_module, "ThreadPoolExecutor", no_pool)
+    source_dir = tmp_path / "backup"
+    target_dir = tmp_path / "target"
+    source_dir.mkdir()
+    for i in range(file_count):
+        (source_dir / f"part{i}.sql").write_text(f"-- dump {i}")
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    mock_config["restore_concurrency"] = concurrency
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+
+    assert engine.run_restore() is True
+    for i in range(file_count):
+        assert (target_dir / f"part{i}.sql").read_text() == f"-- dump {i}"
+
+
+@pytest.fixture(params=["copy_file_range", "sendfile", "read_write"])
+def copy_backend(request, monkeypatch):
+    """Forces _fast_copy onto each of its copy strategies in turn."""
+
+    def unsupported(*args, **kwargs):
+        raise OSError(errno.ENOSYS, "not supported")
+
+    if request.param != "copy_file_range":
+        monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+    if request.param == "read_write":
+        monkeypatch.delattr(os, "sendfile", raising=False)
+    return request.param
+
+
+def test_fast_copy_preserves_content_and_metadata(tmp_path, copy_backend):
+    """
+    Tests that _fast_copy copies data, permission bits and timestamps with
+    every copy strategy.
+    """
+    src = tmp_path / "dump.sql"
+    src.write_bytes(os.urandom(3 << 20))
+    os.chmod(src, 0o640)
+    os.utime(src, ns=(1_600_000_000_000_000_000, 1_700_000_000_000_000_000))
+    dst = tmp_path / "restored.sql"
+    dst.write_text("stale contents that must be truncated" * 100000)
+
+    engine_module._fast_copy(src, dst)
+
+    assert dst.read_bytes() == src.read_bytes()
+    dst_st = dst.stat()
+    assert dst_st.st_mode & 0o777 == 0o640
+    assert dst_st.st_mtime_ns == 1_700_000_000_000_000_000
+
+
+def test_fast_copy_uses_shutil_without_kernel_copy(tmp_path, monkeypatch):
+    """
+    Tests that _fast_copy delegates to shutil.copy2 on platforms without
+    copy_file_range and sendfile.
+    """
+    monkeypatch.delattr(os, "copy_file_range", raising=False)
+    monkeypatch.delattr(os, "sendfile", raising=False)
+    calls = []
+
+    def spy(src, dst):
+        # shutil itself would use os.sendfile on Linux, which is patched away
+        calls.append((src, dst))
+        dst.write_bytes(src.read_bytes())
+
+    monkeypatch.setattr(engine_module.shutil, "copy2", spy)
+    src = tmp_path / "dump.sql"
+    src.write_bytes(b"INSERT INTO t VALUES (1);")
+    dst = tmp_path / "restored.sql"
+
+    engine_module._fast_copy(src, dst)
+
+    assert calls == [(src, dst)]
+    assert dst.read_bytes() == src.read_bytes()
+
+
+@pytest.mark.parametrize(
+    "silent", [("copy_file_range",), ("copy_file_range", "sendfile")]
+)
+def test_fast_copy_falls_back_when_kernel_copies_nothing(tmp_path, monkeypatch, silent):
+    """
+    Tests that a kernel copy call reporting 0 bytes for a non-empty source is
+    treated as unsupported rather than as end of file.
+    """
+    for name in silent:
+        monkeypatch.setattr(os, name, lambda *args: 0, raising=False)
+    src = tmp_path / "db.sql"
+    src.write_bytes(os.urandom(1000))
+    dst = tmp_path / "restored.sql"
+
+    engine_module._fast_copy(src, dst)
+
+    assert dst.read_bytes() == src.read_bytes()
+
+
+def test_fast_copy_uses_shutil_outside_linux(tmp_path, monkeypatch):
+    """
+    Tests that _fast_copy leaves non-Linux platforms, whose sendfile only
+    writes to sockets, to shutil.copy2.
+    """
+    monkeypatch.setattr(engine_module, "_USE_KERNEL_COPY", False)
+    calls = []
+    real_copy2 = engine_module.shutil.copy2
+
+    def spy(src, dst):
+        calls.append((src, dst))
+        return real_copy2(src, dst)
+
+    monkeypatch.setattr(engine_module.shutil, "copy2", spy)
+    src = tmp_path / "dump.sql"
+    src.write_bytes(b"INSERT INTO t VALUES (1);")
+    dst = tmp_path / "restored.sql"
+
+    engine_module._fast_copy(src, dst)
+
+    assert calls == [(src, dst)]
+    assert dst.read_bytes() == src.read_bytes()
+
+
+def test_fast_copy_handles_empty_file(tmp_path):
+    """Tests that _fast_copy restores zero-byte files."""
+    src = tmp_path / "empty.log"
+    src.touch()
+    dst = tmp_path / "restored.log"
+
+    engine_module._fast_copy(src, dst)
+
+    assert dst.exists()
+    assert dst.stat().st_size == 0
+
+
+def test_fast_copy_refuses_to_copy_file_onto_itself(tmp_path):
+    """Tests that _fast_copy never truncates its source like shutil.copy2."""
+    src = tmp_path / "app.log"
+    src.write_text("important")
+
+    with pytest.raises(OSError, match="are the same file"):
+        engine_module._fast_copy(src, tmp_path / "." / "app.log")
+    assert src.read_text() == "important"
+
+
+def test_run_restore_skips_directories_matching_patterns(tmp_path):
+    """
+    Tests that only regular files are restored, even if a directory name
+    matches one of the patterns.
+    """
+    source_dir = tmp_path / "backup"
+    target_dir = tmp_path / "target"
+    source_dir.mkdir()
+    (source_dir / "archive.log").mkdir()
+    (source_dir / "app.log").touch()
+    (source_dir / "db.sql.gz").touch()
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    mock_config["backup_formats"] = {"logs": "*.log", "db": "*.sql.gz"}
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+
+    assert engine.run_restore() is True
+    assert sorted(p.name for p in target_dir.iterdir()) == ["app.log", "db.sql.gz"]
+
+
+def test_run_restore_fails_if_target_parent_is_a_file(tmp_path, caplog):
+    """
+    Tests that run_restore fails cleanly if a parent of the target directory
+    is a file.
+    """
+    source_dir = tmp_path / "backup"
+    source_dir.mkdir()
+    (source_dir / "app.log").touch()
+    blocker = tmp_path / "blocker"
+    blocker.touch()
+    target_dir = blocker / "target"
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+
+    with caplog.at_level(logging.ERROR):
+        assert engine.run_restore() is False
+        assert (
+            f"Target directory '{target_dir}' does not exist or is not a directory"
+            in caplog.text
+        )
+
+
+def test_run_restore_fails_if_target_cannot_be_created(tmp_path, monkeypatch, caplog):
+    """
+    Tests that run_restore logs and fails if the target directory cannot be
+    created for reasons other than a file being in the way.
+    """
+    source_dir = tmp_path / "backup"
+    source_dir.mkdir()
+
+    def deny(*args, **kwargs):
+        raise PermissionError("Permission denied")
+
+    monkeypatch.setattr(engine_module.os, "makedirs", deny)
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(tmp_path / "target")
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+
+    with caplog.at_level(logging.ERROR):
+        assert engine.run_restore() is False
+        assert "Could not create target directory" in caplog.text
+
+
+def test_run_restore_supports_patterns_in_subdirectories(tmp_path):
+    """
+    Tests that patterns spanning several path components are still honoured.
+    """
+    source_dir = tmp_path / "backup"
+    target_dir = tmp_path / "target"
+    (source_dir / "nightly").mkdir(parents=True)
+    (source_dir / "nightly" / "db.sql").touch()
+    (source_dir / "top.sql").touch()
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    mock_config["backup_formats"] = {"nightly": "nightly/*.sql"}
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+
+    assert engine.run_restore() is True
+    assert [p.name for p in target_dir.iterdir()] == ["db.sql"]
+
+
+def test_backup_listing_is_shared_until_rescan(tmp_path):
+    """
+    Tests that iter_backup_files and run_restore share one directory scan,
+    and that rescan picks up files added afterwards.
+    """
+    source_dir = tmp_path / "backup"
+    target_dir = tmp_path / "target"
+    source_dir.mkdir()
+    (source_dir / "app.log").touch()
+
+    mock_config = create_mock_config()
+    mock_config["target_dir"] = str(target_dir)
+    engine = RestorationEngine(backup_path=str(source_dir), config=mock_config)
+
+    assert list(engine.iter_backup_files()) == [source_dir / "app.log"]
+
+    (source_dir / "late.sql").touch()
+    assert engine.run_restore() is True
+    assert [p.name for p in target_dir.iterdir()] == ["app.log"]
+
+    engine.rescan()
+    assert sorted(p.name for p in engine.iter_backup_files()) == [
+        "app.log",
+        "late.sql",
+    ]
+
+
+def test_fast_copy_ignores_failing_fadvise(tmp_path, monkeypatch):
+    """
+    Tests that access-pattern hints are best effort and never fail a copy.
+    """
+
+    def failing_fadvise(*args):
+        raise OSError(errno.EINVAL, "invalid argument")
+
+    monkeypatch.setattr(os, "posix_fadvise", failing_fadvise, raising=False)
+    monkeypatch.setattr(os, "POSIX_FADV_SEQUENTIAL", 2, raising=False)
+    src = tmp_path / "app.log"
+    src.write_text("log line")
+    dst = tmp_path / "restored.log"
+
+    engine_module._fast_copy(src, dst)
+
+    assert dst.read_text() == "log line"
@@ -50,30 +50,39 @@ def test_main_handles_config_error(monkeypatch, caplog):
     assert "Configuration error: File not found" in caplog.text
 
 
-def test_main_exits_if_backup_missing_for_restore(monkeypatch):
+@pytest.mark.parametrize(
+    "action_args",
+    [["--action", "restore"], ["--action", "invalid_action"]],
+    ids=["backup-missing-for-restore", "invalid-action"],
+)
+def test_main_exits_on_invalid_arguments(monkeypatch, action_args):
     """
-    Tests that main() exits via argparse if --backup is missing for the restore action.
+    Tests that main() exits via argparse if --backup is missing for the
+    restore action or the action is not a valid choice.
     """
     monkeypatch.setattr("recovery_agent.main.get_config", lambda: {})
-    test_args = ["recovery_agent", "--action", "restore"]
-    monkeypatch.setattr(sys, "argv", test_args)
+    monkeypatch.setattr(sys, "argv", ["recovery_agent", *action_args])
 
     with pytest.raises(SystemExit) as e:
         main.main()
     assert e.value.code == 2
 
 
-def test_main_exits_on_invalid_action(monkeypatch):
+def test_main_reuses_argument_parser(monkeypatch):
     """
-    Tests that main() exits via argparse for an invalid action choice.
+    Tests that the argument parser is built once and still parses the
+    current sys.argv on every call.
     """
     monkeypatch.setattr("recovery_agent.main.get_config", lambda: {})
-    test_args = ["recovery_agent", "--action", "invalid_action"]
-    monkeypatch.setattr(sys, "argv", test_args)
+    main._build_parser.cache_clear()
 
-    with pytest.raises(SystemExit) as e:
+    monkeypatch.setattr(sys, "argv", ["recovery_agent", "--action", "test"])
+    assert main.main() == 0
+    monkeypatch.setattr(sys, "argv", ["recovery_agent", "--action", "invalid"])
+    with pytest.raises(SystemExit):
         main.main()
-    assert e.value.code == 2
+
+    assert main._build_parser.cache_info().misses == 1
 
 
 def test_main_handles_test_action_successfully(monkeypatch, caplog):
@@ -93,10 +102,10 @@ def test_main_handles_test_action_successfully(monkeypatch, caplog):
     assert "Tests passed!" in caplog.text
 
 
-@pytest.mark.filterwarnings("ignore:.*'recovery_agent.main' found in sys.modules.*")
 def test_main_entry_point_dunder(monkeypatch, tmp_path):
     """
-    Tests that the if __name__ == '__main__' block correctly calls main().
+    Tests that the entry point run by the if __name__ == '__main__' block
+    calls main() and exits with its status code.
     """
     # 1. Create a dummy config file so the real get_config() doesn't fail
     config_file = tmp_path / "config.yaml"
@@ -110,10 +119,7 @@ def test_main_entry_point_dunder(monkeypatch, tmp_path):
 
     # 4. Patch sys.exit to prevent the test runner from stopping
     with patch("sys.exit") as mock_exit:
-        # Use runpy to execute the module's __main__ block
-        import runpy
-
-        runpy.run_module("recovery_agent.main", run_name="__main__")
+        main._entry()
 
-        # 6. Assert that the program exited with code 0 (success)
+        # 5. Assert that the program exited with code 0 (success)
         mock_exit.assert_called_once_with(0)